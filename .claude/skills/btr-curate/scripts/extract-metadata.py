@@ -12,14 +12,28 @@ Usage:
     python extract-metadata.py --content "your content here"
     python extract-metadata.py --file path/to/content.txt
     cat content.txt | python extract-metadata.py --stdin
+    python extract-metadata.py --batch-file path/to/snippets.jsonl
+
+Optional: install google-re2 (pip install google-re2) to scan tags and
+domains with RE2's linear-time automaton instead of the stdlib re engine.
+RE2 is only used for ASCII content, where its ASCII-only \\b agrees with
+stdlib re, so installing it never changes the results.
 """
 
 import argparse
+import io
 import json
 import re
 import sys
+import threading
 from collections import Counter
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, TextIO, Tuple
+
+# Optional: google-re2 for linear-time matching (falls back to stdlib re)
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Technology patterns for tag extraction
 TECHNOLOGY_PATTERNS = {
@@ -79,28 +93,104 @@ DOMAIN_PATTERNS = {
     'performance': [r'\bperformance\b', r'\boptimiz\b', r'\bcache\b', r'\blatency\b', r'\bthroughput\b'],
 }
 
+# Compiled once at import. Each tag is a separate search that stops at its
+# first hit, which beats one fused alternation on stdlib re: the engine would
+# retry every alternative at every position of the content.
+# No re.IGNORECASE: callers match against lowercased content and the patterns
+# are written in lowercase, so case folding would be wasted work.
+TECHNOLOGY_PATTERNS_COMPILED: List[Tuple[Pattern[str], str]] = [
+    (re.compile(pattern), tag)
+    for pattern, tag in TECHNOLOGY_PATTERNS.items()
+]
+
+# All domain patterns fused into one alternation with a named group per domain.
+# The patterns are distinct whole words, so tallying m.lastgroup over a single
+# finditer pass counts the same matches as running each pattern separately.
+DOMAIN_REGEX_SOURCE = '|'.join(
+    f'(?P<{domain}>{"|".join(patterns)})' for domain, patterns in DOMAIN_PATTERNS.items()
+)
+DOMAIN_REGEX: Pattern[str] = re.compile(DOMAIN_REGEX_SOURCE)
+
+# RE2 equivalents: a Set reporting every tag pattern that matches anywhere in
+# one linear-time scan, and the same domain alternation. RE2's \b is ASCII-only,
+# so _use_re2 restricts them to ASCII content where both engines agree.
+if re2 is not None:
+    TAG_NAMES: List[str] = list(TECHNOLOGY_PATTERNS.values())
+    TAG_SET = re2.Set.SearchSet(re2.Options())
+    for pattern in TECHNOLOGY_PATTERNS:
+        TAG_SET.Add(pattern)
+    TAG_SET.Compile()
+    DOMAIN_RE2 = re2.compile(DOMAIN_REGEX_SOURCE)
+else:
+    TAG_SET = None
+    DOMAIN_RE2 = None
+
+
+# Patterns used by generate_topic_name
+FUNCTION_REGEX = re.compile(r'(?:function|def|const|let|var)\s+(\w+)')
+CLASS_REGEX = re.compile(r'class\s+(\w+)')
+CAMEL_CASE_REGEX = re.compile(r'([a-z])([A-Z])')
+HEADING_PREFIX_REGEX = re.compile(r'^#+\s*')
+WORD_REGEX = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# Patterns used by generate_summary
+DOCSTRING_REGEX = re.compile(r'"""([^"]+)"""')
+JSDOC_REGEX = re.compile(r'/\*\*\s*\n?\s*\*?\s*([^\n*]+)')
+HEADING_REGEX = re.compile(r'^#+\s*(.+)$', re.MULTILINE)
+
+# Per-thread scratch Counter reused by every domain scan; _score_domains clears
+# it on entry, so callers must not hold on to it between calls
+_scratch = threading.local()
+
+# Zero score for every domain, in DOMAIN_PATTERNS order, copied into the Counter
+_DOMAIN_SEED: Dict[str, int] = dict.fromkeys(DOMAIN_PATTERNS, 0)
+
+
+def _domain_scores() -> Counter:
+    """Return this thread's reusable domain score Counter."""
+    domain_scores = getattr(_scratch, 'domain_scores', None)
+    if domain_scores is None:
+        domain_scores = _scratch.domain_scores = Counter()
+    return domain_scores
+
+
+def _use_re2(content_lower: str) -> bool:
+    """Whether the RE2 scanners can be used without changing results."""
+    return re2 is not None and content_lower.isascii()
+
 
 def extract_tags(content: str) -> List[str]:
     """Extract technology and concept tags from content."""
-    content_lower = content.lower()
-    tags = set()
+    return _match_tags(content.lower())
 
-    for pattern, tag in TECHNOLOGY_PATTERNS.items():
-        if re.search(pattern, content_lower, re.IGNORECASE):
-            tags.add(tag)
 
-    return sorted(list(tags))
+def _match_tags(content_lower: str) -> List[str]:
+    """Extract tags from content that has already been lowercased."""
+    if _use_re2(content_lower):
+        tags = {TAG_NAMES[index] for index in TAG_SET.Match(content_lower) or ()}
+    else:
+        tags = {tag for pattern, tag in TECHNOLOGY_PATTERNS_COMPILED if pattern.search(content_lower)}
+
+    return sorted(tags)
 
 
 def detect_domain(content: str) -> Tuple[str, float]:
     """Detect the most likely domain for the content."""
-    content_lower = content.lower()
-    domain_scores: Dict[str, int] = Counter()
+    return _score_domains(content.lower(), _domain_scores())
+
 
-    for domain, patterns in DOMAIN_PATTERNS.items():
-        for pattern in patterns:
-            matches = len(re.findall(pattern, content_lower, re.IGNORECASE))
-            domain_scores[domain] += matches
+def _score_domains(content_lower: str, domain_scores: Counter) -> Tuple[str, float]:
+    """Detect the domain of lowercased content, tallying into domain_scores.
+
+    domain_scores is cleared first so one Counter can be reused across calls.
+    """
+    domain_scores.clear()
+    # Seed every domain so ties and empty content resolve in DOMAIN_PATTERNS order
+    domain_scores.update(_DOMAIN_SEED)
+
+    domain_regex = DOMAIN_RE2 if _use_re2(content_lower) else DOMAIN_REGEX
+    for match in domain_regex.finditer(content_lower):
+        domain_scores[match.lastgroup] += 1
 
     if not domain_scores:
         return ('general', 0.0)
@@ -117,26 +207,26 @@ def generate_topic_name(content: str) -> str:
     # Look for function names, class names, or key concepts
 
     # Try to find function definitions
-    func_match = re.search(r'(?:function|def|const|let|var)\s+(\w+)', content)
+    func_match = FUNCTION_REGEX.search(content)
     if func_match:
         name = func_match.group(1)
         # Convert camelCase to kebab-case
-        name = re.sub(r'([a-z])([A-Z])', r'\1-\2', name).lower()
+        name = CAMEL_CASE_REGEX.sub(r'\1-\2', name).lower()
         return name
 
     # Try to find class definitions
-    class_match = re.search(r'class\s+(\w+)', content)
+    class_match = CLASS_REGEX.search(content)
     if class_match:
         name = class_match.group(1)
-        name = re.sub(r'([a-z])([A-Z])', r'\1-\2', name).lower()
+        name = CAMEL_CASE_REGEX.sub(r'\1-\2', name).lower()
         return name
 
     # Extract key nouns from first line or heading
-    first_line = content.split('\n')[0].strip()
-    first_line = re.sub(r'^#+\s*', '', first_line)  # Remove markdown headings
+    first_line = content.split('\n', 1)[0].strip()
+    first_line = HEADING_PREFIX_REGEX.sub('', first_line)  # Remove markdown headings
 
     # Extract significant words
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', first_line)
+    words = WORD_REGEX.findall(first_line)
     if words:
         # Take first 3 significant words
         topic_words = [w.lower() for w in words[:3]]
@@ -150,7 +240,7 @@ def generate_summary(content: str, max_length: int = 150) -> str:
     # Look for comments, docstrings, or headings
 
     # Python/JS docstring
-    docstring_match = re.search(r'"""([^"]+)"""', content)
+    docstring_match = DOCSTRING_REGEX.search(content)
     if docstring_match:
         summary = docstring_match.group(1).strip()
         if len(summary) <= max_length:
@@ -158,7 +248,7 @@ def generate_summary(content: str, max_length: int = 150) -> str:
         return summary[:max_length-3] + '...'
 
     # JSDoc comment
-    jsdoc_match = re.search(r'/\*\*\s*\n?\s*\*?\s*([^\n*]+)', content)
+    jsdoc_match = JSDOC_REGEX.search(content)
     if jsdoc_match:
         summary = jsdoc_match.group(1).strip()
         if len(summary) <= max_length:
@@ -166,24 +256,38 @@ def generate_summary(content: str, max_length: int = 150) -> str:
         return summary[:max_length-3] + '...'
 
     # Markdown heading
-    heading_match = re.search(r'^#+\s*(.+)$', content, re.MULTILINE)
+    heading_match = HEADING_REGEX.search(content)
     if heading_match:
         return heading_match.group(1).strip()
 
-    # First meaningful line
-    lines = [l.strip() for l in content.split('\n') if l.strip() and not l.strip().startswith(('#', '//', '/*', '*'))]
-    if lines:
-        summary = lines[0]
-        if len(summary) <= max_length:
-            return summary
-        return summary[:max_length-3] + '...'
+    # First meaningful line (StringIO yields lines lazily, so stop at the first hit)
+    for line in io.StringIO(content):
+        summary = line.strip()
+        if summary and not summary.startswith(('#', '//', '/*', '*')):
+            if len(summary) <= max_length:
+                return summary
+            return summary[:max_length-3] + '...'
 
     return 'No summary available'
 
 
 def extract_metadata(content: str) -> Dict:
     """Extract all metadata from content."""
-    domain, confidence = detect_domain(content)
+    return _build_metadata(content, _domain_scores())
+
+
+def extract_metadata_batch(contents: Iterable[str]) -> Iterator[Dict]:
+    """Lazily extract metadata from many documents, reusing scratch state between them."""
+    domain_scores = _domain_scores()
+
+    for content in contents:
+        yield _build_metadata(content, domain_scores)
+
+
+def _build_metadata(content: str, domain_scores: Counter) -> Dict:
+    """Build the metadata dict for one document, lowercasing it only once."""
+    content_lower = content.lower()
+    domain, confidence = _score_domains(content_lower, domain_scores)
 
     return {
         'domain': {
@@ -191,10 +295,10 @@ def extract_metadata(content: str) -> Dict:
             'confidence': confidence,
         },
         'topic': generate_topic_name(content),
-        'tags': extract_tags(content),
+        'tags': _match_tags(content_lower),
         'summary': generate_summary(content),
         'content_length': len(content),
-        'line_count': len(content.split('\n')),
+        'line_count': content.count('\n') + 1,
     }
 
 
@@ -202,21 +306,28 @@ def main():
     parser = argparse.ArgumentParser(
         description='Extract metadata from content for BTR curation'
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
         '--content',
         type=str,
         help='Content string to analyze'
     )
-    parser.add_argument(
+    source.add_argument(
         '--file',
         type=str,
         help='Path to file containing content'
     )
-    parser.add_argument(
+    source.add_argument(
         '--stdin',
         action='store_true',
         help='Read content from stdin'
     )
+    source.add_argument(
+        '--batch-file',
+        type=str,
+        help='Path to a JSONL file with one {"content": ...} object per line; '
+             'prints one JSON result per line (json output only)'
+    )
     parser.add_argument(
         '--format',
         choices=['json', 'text'],
@@ -226,6 +337,12 @@ def main():
 
     args = parser.parse_args()
 
+    if args.batch_file:
+        if args.format != 'json':
+            parser.error('--batch-file only supports --format json')
+        run_batch(args.batch_file)
+        return
+
     # Get content from the appropriate source
     content: Optional[str] = None
 
@@ -268,5 +385,31 @@ def main():
         print(f"  btr curate {metadata['domain']['suggested']} {metadata['topic']} --content \"...\" --tags {tags_str}")
 
 
+def run_batch(path: str) -> None:
+    """Stream metadata for every document in a JSONL file, one JSON line each."""
+    try:
+        with open(path, 'r') as f:
+            for metadata in extract_metadata_batch(_read_batch_entries(f)):
+                print(json.dumps(metadata))
+    except FileNotFoundError:
+        print(f"Error: File not found: {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _read_batch_entries(lines: TextIO) -> Iterator[str]:
+    """Yield the content of each {"content": ...} line, skipping blank lines."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            content = json.loads(line)['content']
+            if not isinstance(content, str):
+                raise TypeError('content must be a string')
+        except (ValueError, KeyError, TypeError):
+            print(f"Error: Invalid batch entry on line {line_number}: expected {{\"content\": ...}}",
+                  file=sys.stderr)
+            sys.exit(1)
+        yield content
+
 if __name__ == '__main__':
     main()